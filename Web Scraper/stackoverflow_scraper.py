@@ -1,1782 +1,1109 @@
 from flask import Flask, jsonify, request, Response
 import os
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+import lxml.html
+from io import BytesIO
 import re
-import pytz
-import json
+import orjson
 import time
-from datetime import datetime
+import threading
+import calendar
+import html
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
 
 app = Flask(__name__)
 
-GMT_zone = pytz.timezone('UTC')
+QUESTION_ID_RE = re.compile(r'/questions/(\d+)/')
+ACCOUNT_ID_RE = re.compile(rb'StackExchange\.user\.init[^<]*?accountId:\s*(\d+)')
+REPUTATION_RE = re.compile(r'(\d[\d.,]*)\s*([mk]?)', re.IGNORECASE)
+REPUTATION_SCALE = {"": 1, "k": 1000, "m": 1_000_000}
+
+# executor only runs page fetches and single-page scrapes, which never wait on other tasks.
+# Per-post scraping runs on scrape_executor so a scrape task can hand fetches to executor without starving it.
+executor = ThreadPoolExecutor(max_workers=32)
+scrape_executor = ThreadPoolExecutor(max_workers=16)
+
+# Throttled or failing requests are retried a bounded number of times, honouring Retry-After
+RETRY = Retry(
+    total=5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    backoff_factor=1,
+    respect_retry_after_header=True,
+    allowed_methods=["GET"],
+)
+
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=RETRY))
+SESSION.headers.update({
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+})
+
+# Question, timeline and profile pages are memoized by URL for a few minutes.
+# Pages are kept decompressed in memory, so the cache is bounded well below what the pool could fetch.
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_TTL = 300
+
+response_cache = OrderedDict()
+response_cache_lock = threading.Lock()
+
+# Scraped profiles are small, so many more of them are kept, for the same few minutes as the pages
+PROFILE_CACHE_SIZE = 4096
+
+profile_cache = OrderedDict()
+profile_cache_lock = threading.Lock()
+
+# There are only a handful of collectives, and every answer on a collective's questions links the same page
+COLLECTIVE_CACHE_SIZE = 64
+
+collective_cache = OrderedDict()
+collective_cache_lock = threading.Lock()
+
+# filter=total only needs the question count shown above the listing
+TOTAL_CLASS = "fs-body3 flex--item fl1 mr12 sm:mr0 sm:mb12"
+TOTAL_STRAINER = SoupStrainer("div", class_=TOTAL_CLASS)
+
+TAB_SORTS = frozenset({'hot', 'week', 'month'})
+RANGE_SORTS = frozenset({'votes', 'creation'})
+SORT_KEYS = {'activity': 'last_activity_date', 'creation': 'creation_date', 'votes': 'score'}
+VALID_SORTS = frozenset({'activity', 'creation', 'votes'})
+VALID_LISTING_SORTS = VALID_SORTS | TAB_SORTS
+VALID_ORDERS = frozenset({'desc', 'asc'})
+VALID_FILTERS = frozenset({'default', 'withbody', 'none', 'total'})
+INVALID_LISTING_SORT_ERROR = "Invalid sort parameter. Valid options are: activity, creation, votes, hot, week, month"
+INVALID_ORDER_ERROR = "Invalid order parameter. Valid options are: desc, asc"
+
+
+def has_class(name):
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+RELATIVETIME_XPATH = etree.XPath(f'.//span[{has_class("relativetime")}]')
+EVENT_CELL_XPATH = etree.XPath(f'.//td[{has_class("wmn1")}]')
+EVENT_COMMENT_XPATH = etree.XPath(f'.//td[{has_class("event-comment")}]')
+COMMENT_USER_XPATH = etree.XPath(f'.//a[{has_class("comment-user")}]')
+OWNER_LINK_XPATH = etree.XPath(f'.//a[{has_class("comment-user")} and {has_class("owner")}]')
+NOWRAP_CELL_XPATH = etree.XPath(f'.//td[{has_class("ws-nowrap")}]')
+CREATION_DATE_XPATH = etree.XPath(f'.//td[{has_class("ws-nowrap")} and {has_class("creation-date")}]//span[{has_class("relativetime")}]/@title', smart_strings=False)
+
+SUMMARY_XPATH = etree.XPath(f'//div[{has_class("s-post-summary")}]')
+SUMMARY_SCORE_XPATH = etree.XPath('.//div[starts-with(@title, "Score of ")]/@title')
+BOUNTY_XPATH = etree.XPath(f'//aside[{has_class("js-bounty-notification")}]')
+BOUNTY_DATE_XPATH = etree.XPath('.//span[@title]/@title', smart_strings=False)
+BOUNTY_AMOUNT_XPATH = etree.XPath(f'.//span[{has_class("s-badge__bounty")}]')
+POST_NOTICE_XPATH = etree.XPath(f'//aside[{has_class("js-post-notice")}] | //*[{has_class("question-status")}]')
+COMMUNITY_WIKI_XPATH = etree.XPath(f'.//*[{has_class("community-wiki")}]')
+CREATION_TIME_XPATH = etree.XPath('//time[@itemprop="dateCreated"]/@datetime', smart_strings=False)
+QUESTION_XPATH = etree.XPath(f'//div[{has_class("question")}]')
+VOTE_COUNT_XPATH = etree.XPath(f'.//div[{has_class("js-vote-count")}]/@data-value')
+AUTHOR_CARD_XPATH = etree.XPath(f'.//div[{has_class("user-details")} and @itemprop="author"]')
+LAST_EDITED_XPATH = etree.XPath(f'.//a[@title="show all edits to this post"]//span[{has_class("relativetime")}]/@title', smart_strings=False)
+LAST_ACTIVITY_XPATH = etree.XPath('//a[@href="?lastactivity"]/@title', smart_strings=False)
+TAG_TEXT_XPATH = etree.XPath(f'.//a[{has_class("post-tag")}]/text()')
+VIEW_COUNT_XPATH = etree.XPath('//div[@class="flex--item ws-nowrap mb8"]/@title')
+ANSWER_HEADER_COUNT_XPATH = etree.XPath('//div[@id="answers"]//h2/@data-answercount')
+ANSWER_COUNT_XPATH = etree.XPath(f'count(//div[{has_class("answer")}])')
+PROFILE_IMAGE_XPATH = etree.XPath(f'//div[{has_class("bar-md")} and {has_class("bs-sm")}]//img/@src', smart_strings=False)
+PROFILE_REPUTATION_XPATH = etree.XPath(f'//div[{has_class("fs-body3")} and {has_class("fc-black-600")}]')
+TITLE_XPATH = etree.XPath(f'//a[{has_class("question-hyperlink")}]')
+BODY_XPATH = etree.XPath(f'.//div[{has_class("s-prose")}]')
+
+ANSWER_XPATH = etree.XPath(f'//div[{has_class("answer")}]')
+POST_ID_XPATH = etree.XPath(f'//div[{has_class("js-voting-container")}]/@data-post-id')
+ACCEPTED_XPATH = etree.XPath(f'.//div[{has_class("js-accepted-answer-indicator")} and not({has_class("d-none")})]')
+COLLECTIVE_XPATH = etree.XPath(f'//div[{has_class("themed-tc")}]')
+
+
+class ScrapeError(Exception):
+    pass
+
+
+class NotFoundError(ScrapeError):
+    pass
+
+
+@app.errorhandler(ScrapeError)
+def handle_scrape_error(error):
+    return jsonify({"error": str(error)}), 500
+
 
+@app.errorhandler(NotFoundError)
+def handle_not_found_error(error):
+    return jsonify({"error": str(error)}), 404
 
-def make_request(url):
-    
-    delay = 60
-
-    while True:
-        response = requests.get(url)
-        
-        if not response.status_code == 429:
-            return response
-        
-        time.sleep(delay)
-        delay *= 2  
-    
-
-
-@app.route('/questions', methods=['GET'])
-def get_questions():
-
-    site = request.args.get('site')
-    if not site or site.lower() != 'stackoverflow':
-        return jsonify({"error": "The 'site' parameter is required and must be 'stackoverflow'"}), 400
-
-
-    min_value = request.args.get('min', type=int)
-    max_value = request.args.get('max', type=int)
-    sort = request.args.get('sort', default='activity')
-    order = request.args.get('order', default='desc')
-    filter = request.args.get('filter', default='default')
-    tagged = request.args.get('tagged', default='', type=str)
-    page = request.args.get('page', default=1, type=int)
-    pagesize = request.args.get('pagesize', default=3, type=int)
-
-
-    valid_sorts = ['activity', 'creation', 'votes', 'hot', 'week', 'month']
-    if sort not in valid_sorts:
-        return jsonify({"error": f"Invalid sort parameter. Valid options are: {', '.join(valid_sorts)}"}), 400
-
-    valid_orders = ['desc', 'asc']
-    if order not in valid_orders:
-        return jsonify({"error": f"Invalid order parameter. Valid options are: {', '.join(valid_orders)}"}), 400
-
-    if page < 1:
-        return jsonify({"error": "Page number must be 1 or greater"}), 400
-    
-
-    base_url = "https://stackoverflow.com/questions"
-    url = base_url
-
-    query_params = []
-
-    tags_to_filter = [tag.strip() for tag in tagged.split(';') if tag.strip()]
-    if len(tags_to_filter) > 3:
-        return jsonify({"error": "You can specify up to 3 tags only."}), 400
-    if tags_to_filter:
-        tags_query = '+'.join(f'[{tag}]' for tag in tags_to_filter)
-        query_params.append(tags_query)
-
-        query_string = '+'.join(query_params)
-        url = f"{base_url}/tagged/{query_string}"
-
-
-    if sort in ['hot', 'week', 'month']:
-        if '?' in url:
-            url += f"&tab={sort}"
-        else:
-            url += f"?tab={sort}"
-
-    if '?' in url:
-        url += f"&page={page}"
-    else:
-        url += f"?page={page}"
-
-    print(url)
-
- 
-    withbody = False
-    total = False
-
-    if filter not in ['default', 'withbody', 'none', 'total']:
-        return jsonify({"error": "Invalid filter type"}), 400
-    if filter == "none":
-        return jsonify({})
-    if filter == "withbody":
-        withbody = True
-    if filter == "total":
-        total = True
-
-
-    response = make_request(url)
-
-    if response.status_code != 200:
-        return jsonify({"error": "Failed to fetch questions from Stack Overflow"}), 500
-
-    items = []
-
-    soup = BeautifulSoup(response.content, "html.parser")
-
-    if total:
-        total_div = soup.find('div', class_='fs-body3 flex--item fl1 mr12 sm:mr0 sm:mb12')
-        questions_text = total_div.get_text(strip=True)
-        questions_text = questions_text.replace('\n', '').replace('\r', '').strip()
-        number_of_questions = questions_text.split(' ')[0].replace(',', '')
-        if pagesize < int(number_of_questions):
-            return jsonify({"Total": pagesize})
-        return jsonify({"Total": number_of_questions})
-
-    count = 0
-
-    question_summaries = soup.find_all("div", class_="s-post-summary")
-    for summary in question_summaries:
-        count += 1
-        if count > pagesize: break
-
-        question_id = int(summary["data-post-id"])
 
-        url = f"https://stackoverflow.com/questions/{question_id}"
+@app.errorhandler(requests.exceptions.RequestException)
+def handle_request_error(error):
+    return jsonify({"error": "Stack Overflow is unavailable, try again later"}), 503
 
-        response = make_request(url)
 
-        if response.status_code != 200:
-            return jsonify({"error": "Failed to fetch the question from Stack Overflow"}), 500
-
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        aside_element = soup.find('aside', class_='js-bounty-notification')
-
-        bounty_amount = None
-        bounty_closes_date = None
+def make_request(url):
+    return SESSION.get(url, timeout=10)
 
-        if aside_element:
-            date_span = aside_element.find('span', title=True)
-            date_bounty_str = date_span['title'] if date_span else None
 
-            date_bounty_norm = datetime.strptime(date_bounty_str, "%Y-%m-%d %H:%M:%SZ")
-            GMT_creation = GMT_zone.localize(date_bounty_norm)
-            zone = GMT_creation.astimezone(pytz.UTC)
-            bounty_closes_date = int(zone.timestamp())
+def pretty_requested():
+    # Responses are compact unless the caller asks for ?pretty=true
+    return request.args.get('pretty', default='false').lower() == 'true'
 
-            bounty_span = aside_element.find('span', class_='s-badge__bounty')
-            bounty_amount = int(bounty_span.text.strip().replace('+', '')) if bounty_span else None
 
-        summary = soup.find("div", class_="question")
+def json_response(payload):
+    option = orjson.OPT_INDENT_2 if pretty_requested() else None
+    return Response(orjson.dumps(payload, option=option), mimetype='application/json')
 
-        if summary:
 
-            score = 0
+def stream_items(items):
+    yield b'{"items":['
+    for index, item in enumerate(items):
+        if index:
+            yield b','
+        yield orjson.dumps(item)
+    yield b']}'
 
-            div_tag = summary.find('div', class_='js-voting-container')
-            quest_id = int(div_tag['data-post-id']) if div_tag else None
 
-            div_tag = summary.find('div', class_='js-vote-count')
-            score = int(div_tag['data-value']) if div_tag else None
+def items_response(items):
+    # Compact item lists are sent one item at a time instead of being serialized into a single buffer
+    if pretty_requested():
+        return json_response({"items": items})
+    return Response(stream_items(items), mimetype='application/json')
 
-            user_card = summary.find("div", class_="user-details", itemprop="author") 
-            profile_link = "aa"
-            display_name = ""
 
-            anchor_tag = user_card.find("a") if user_card else None
+# Timeline rows often repeat the same timestamp, and the cached lookup is cheaper than re-slicing it. The date
+# XPaths return plain strings, since lxml's smart strings would keep their whole document alive as cache keys
+@lru_cache(maxsize=2048)
+def to_timestamp(date_str):
+    # Stack Overflow renders every timestamp as "YYYY-MM-DD HH:MM:SSZ" (or with a "T" separator), which is
+    # already UTC and fixed width, so the fields are sliced out rather than run through strptime
+    return calendar.timegm((
+        int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+        int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19]),
+    ))
 
-            if anchor_tag and anchor_tag.get("href"):
-                profile_link = "https://stackoverflow.com" + anchor_tag["href"]
-                display_name = anchor_tag.text.strip() 
-                            
 
-            last_edited_date = None
+def cache_lookup(cache, lock, key, now):
+    with lock:
+        cached = cache.get(key)
+        if cached and now - cached[0] < RESPONSE_CACHE_TTL:
+            cache.move_to_end(key)
+            return cached[1]
+    return None
 
-            edited_element = summary.find('a', title="show all edits to this post")
-            if edited_element:
-                last_edited_date_str = edited_element.find('span', class_='relativetime')['title']
-                last_edited_date_norm = datetime.strptime(last_edited_date_str, "%Y-%m-%d %H:%M:%SZ")
-                GMT_last_edited = GMT_zone.localize(last_edited_date_norm)
-                last_edited_date = int(GMT_last_edited.astimezone(pytz.UTC).timestamp())
 
+def cache_store(cache, lock, key, now, value, size):
+    with lock:
+        cache[key] = (now, value)
+        cache.move_to_end(key)
+        if len(cache) > size:
+            cache.popitem(last=False)
 
-            modified_date_element = soup.find('a', href="?lastactivity")
-            modified_date = modified_date_element['title'] if modified_date_element else None
 
-            if modified_date:
-                modified_date_norm = datetime.strptime(modified_date, "%Y-%m-%d %H:%M:%SZ")
-                GMT_last = GMT_zone.localize(modified_date_norm)
-                zone = GMT_last.astimezone(pytz.UTC)
-                last_activity_date = int(zone.timestamp())
+def cached_request(url):
 
-            
-            tag_elements = summary.find_all("a", class_="post-tag")
-            tags = [tag.text.strip() for tag in tag_elements]
+    now = time.monotonic()
 
-           
-            view_tag = soup.find('div', class_='flex--item ws-nowrap mb8')
+    response = cache_lookup(response_cache, response_cache_lock, url, now)
+    if response is not None:
+        return response
 
-        
-            if view_tag and 'title' in view_tag.attrs:
-                title = view_tag['title']
-                view_str = title.split()[1].replace(',', '')
-                view_count = int(view_str)
-            else:
-                view_count = None
+    response = make_request(url)
 
-            answer_count = len(soup.find_all("div", class_="answer"))
+    if response.status_code == 200:
+        cache_store(response_cache, response_cache_lock, url, now, response, RESPONSE_CACHE_SIZE)
 
-            if answer_count > 0:
-                is_answered = True
-            else:
-                is_answered = False
+    return response
 
-            title = soup.find("a", class_="question-hyperlink").text.strip()
 
-            link = url
-            
-            time_url = "https://stackoverflow.com/posts/" + str(question_id) + "/timeline"
+def parse(content, parse_only=None):
+    # Stack Overflow always serves UTF-8, so BeautifulSoup does not need to sniff the encoding
+    return BeautifulSoup(content, "lxml", parse_only=parse_only, from_encoding="utf-8")
 
-            response_date = make_request(time_url)
-            if response_date.status_code == 200:
-                time_soup = BeautifulSoup(response_date.content, 'html.parser')   
-                
-           
-                closed_date = None
-                closed_reason = None
-                protected_date = None
-                locked_date = None
-                community_owned_date = None
-                unprotected = True
 
-                migrated_date = None
-                migrated_id = None
-                migrated_link = None
-        
-                for row in time_soup.find_all('tr'):
-                    
-                    date_element = row.find('span', class_='relativetime')
-                    date_str = date_element['title'] if date_element else None
-
-                    if not date_str:
-                        continue
+def first(results):
+    return results[0] if results else None
 
 
-                    date_norm = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%SZ")
-                    GMT_creation = GMT_zone.localize(date_norm)
-                    zone = GMT_creation.astimezone(pytz.UTC)
-                    date = int(zone.timestamp())
+def element_text(element):
+    return "".join(element.itertext()).strip()
 
-                    event_cell = row.find('td', class_='wmn1')
-                    if event_cell:
-                        event_text = event_cell.text.strip().lower()
-
-                
-                        if "migrated" == event_text:
-                            migrated_date = date
-
-                            comment_cell = row.find('td', class_='event-comment')
-                            if comment_cell:
-                                link_tag = comment_cell.find('a')
-                                if link_tag and 'href' in link_tag.attrs:
-                                    migrated_link = link_tag['href']
-                                    match = re.search(r'/questions/(\d+)/', migrated_link)
-                                    if match:
-                                        migrated_id = int(match.group(1))
-                                    else:
-                                        migrated_id = None 
-
-
-                        if 'unprotected' == event_text:
-                            unprotected = False
-
-                        if 'closed' == event_text and not closed_date:
-                            closed_date = date
-                            comment_element = row.find('td', class_='event-comment')
-                            closed_reason = comment_element.text.strip() if comment_element else None
-
-                        if unprotected:
-                            if 'protected' == event_text and not protected_date:
-                                protected_date = date
-
-                        if 'locked' in event_text and not locked_date:
-                            locked_date = date
-
-                        if "made wiki" == event_text:
-                            community_owned_date = date
-    
-                user_not_exist = False
-                display_name = ""
-                profile_elements = time_soup.find_all('a', class_='comment-user owner')
-
-               
-                if profile_elements:
-                  
-                    last_profile_element = profile_elements[-1]
-                    display_name = last_profile_element.text.strip()
-
-                    if profile_link == "aa":
-                        profile_link = "https://stackoverflow.com" + last_profile_element['href']
-
-            
-                    acc = make_request(profile_link)
-
-                    if response.status_code == 200:
-                        acc_soup = BeautifulSoup(acc.content, "html.parser")
-
-                        img_tag = acc_soup.find('div', class_='bar-md bs-sm').find('img')
-                        profile_image = img_tag['src'] if img_tag else None
-
-                        user_id = profile_link.split("/")[-2]
-                        user_type = "registered"
-
-                        reputation_text = acc_soup.find('div', class_='fs-body3 fc-black-600').text
-                        if "m" in reputation_text:
-                            reputation = int(float(reputation_text.replace('m', '').replace(',', '')) * 1_000_000)
-                        elif "k" in reputation_text:
-                            reputation = int(float(reputation_text.replace('k', '').replace(',', '')) * 1000)
-                        else:
-                            reputation = int(reputation_text.replace(',', ''))
-
-                        reputation = int(reputation_text.replace(',', ''))
-
-                        script_tags = acc_soup.find_all("script")
-                        account_id = None
-
-                        for script in script_tags:
-                            script_text = script.string
-                            if script_text and "StackExchange.user.init" in script_text:
-                    
-                                account_id_match = re.search(r'accountId:\s*(\d+)', script_text)
-                                if account_id_match:
-                                    account_id = account_id_match.group(1)
-                                    break
-
-                elif profile_link != "aa":
-
-                    acc = make_request(profile_link)
-
-                    if response.status_code == 200:
-                        acc_soup = BeautifulSoup(acc.content, "html.parser")
-
-                        img_tag = acc_soup.find('div', class_='bar-md bs-sm').find('img')
-                        profile_image = img_tag['src'] if img_tag else None
-
-                        user_id = profile_link.split("/")[-2]
-                        user_type = "registered"
-
-                        reputation_text = acc_soup.find('div', class_='fs-body3 fc-black-600').text
-                        if "m" in reputation_text:
-                            reputation = int(float(reputation_text.replace('m', '').replace(',', '')) * 1_000_000)
-                        elif "k" in reputation_text:
-                            reputation = int(float(reputation_text.replace('k', '').replace(',', '')) * 1000)
-                        else:
-                            reputation = int(reputation_text.replace(',', ''))
-
-                        reputation = int(reputation_text.replace(',', ''))
-
-                        script_tags = acc_soup.find_all("script")
-                        account_id = None
-
-                        for script in script_tags:
-                            script_text = script.string
-                            if script_text and "StackExchange.user.init" in script_text:
-                    
-                                account_id_match = re.search(r'accountId:\s*(\d+)', script_text)
-                                if account_id_match:
-                                    account_id = account_id_match.group(1)
-                                    break
 
-                else:
-                    user_not_exist = True
-                    all_tds = time_soup.find_all('td', class_='ws-nowrap')
-                    last_td = all_tds[-2] if all_tds else None
+def inner_html(element):
+    # Post bodies are returned as HTML, like the Stack Exchange API's withbody filter, and serialized by libxml2
+    return (html.escape(element.text or "", quote=False) + "".join(lxml.html.tostring(child, encoding="unicode") for child in element)).strip()
 
-                    if last_td:
-                        display_name = last_td.get_text(strip=True)
 
-                date_elements = time_soup.find_all('td', class_='ws-nowrap creation-date')
+def on_migrated(state, row, date):
+    state["migrated_date"] = date
 
-                if date_elements:
-                    creation_date_element = date_elements[-1].find('span', class_='relativetime')
-                    creation_date_str = creation_date_element['title'] if creation_date_element else None
-                    creation_date_norm = datetime.strptime(creation_date_str, "%Y-%m-%d %H:%M:%SZ")
-                    GMT_creation = GMT_zone.localize(creation_date_norm)
-                    zone = GMT_creation.astimezone(pytz.UTC)
-                    creation_date = int(zone.timestamp())
+    comment_cells = EVENT_COMMENT_XPATH(row)
+    if comment_cells:
+        link_tag = comment_cells[0].find('.//a')
+        if link_tag is not None and link_tag.get('href'):
+            state["migrated_link"] = link_tag.get('href')
+            match = QUESTION_ID_RE.search(state["migrated_link"])
+            state["migrated_id"] = int(match.group(1)) if match else None
 
-            body = None
-            if withbody:
-                body_element = summary.find("div", class_="s-prose")
-                if body_element:
-                    body = body_element.get_text(strip=True)
-                
-            owner_data = OrderedDict()
 
-            if user_not_exist:
-                owner_data['user_type'] = "does_not_exist"
-                owner_data['display_name'] = display_name
-            else:
+def on_unprotected(state, row, date):
+    state["unprotected"] = False
 
-                owner_data = {
-                    "account_id": account_id,
-                    "reputation": reputation,
-                    "user_id": user_id,
-                    "user_type": user_type,
-                    "profile_image": profile_image,
-                    "display_name": display_name,
-                    "link": profile_link,
-                }
-
-            migration_data = OrderedDict()
 
-            if migrated_id:
-                migration_data["question_id"] = migrated_id
-            
-            if migrated_date:
-                migration_data["on_date"] = migrated_date
+def on_closed(state, row, date):
+    if not state["closed_date"]:
+        state["closed_date"] = date
+        comment_cells = EVENT_COMMENT_XPATH(row)
+        state["closed_reason"] = element_text(comment_cells[0]) if comment_cells else None
 
-            if migrated_link:
-                migration_data["site_url"] = migrated_link
-                
 
-            question_data = OrderedDict()
+def on_protected(state, row, date):
+    if state["unprotected"] and not state["protected_date"]:
+        state["protected_date"] = date
 
-            question_data["tags"] = tags
-
-            if migrated_link or migrated_id or migrated_date:
-                question_data["migrated_from"] = migration_data
 
-            question_data["owner"] = owner_data
-            question_data["is_answered"] = is_answered
-            question_data["view_count"] = view_count
-            question_data["answer_count"] = answer_count
-            
-            if community_owned_date:
-                question_data['community_owned_date'] = community_owned_date
+def on_locked(state, row, date):
+    if not state["locked_date"]:
+        state["locked_date"] = date
 
 
-            question_data["score"] = score
-            question_data["last_activity_date"] = last_activity_date
-            question_data["creation_date"] = creation_date
-
-            if last_edited_date:
-                question_data["last_edited_date"] = last_edited_date
-
-            if bounty_amount:
-                question_data['bounty_amount'] = bounty_amount
-
-            if bounty_closes_date:
-                question_data["bounty_closes_date"] = bounty_closes_date
+def on_made_wiki(state, row, date):
+    state["community_owned_date"] = date
 
-            if closed_date:
-                question_data["closed_date"] = closed_date
 
-            if protected_date:
-                question_data["protected_date"] = protected_date
+def on_history(state, row, date):
+    # Edits by the Community user are automatic and do not count as activity
+    user_cell = first(COMMENT_USER_XPATH(row))
+    if user_cell is None or user_cell.get('href') == '/users/-1/community':
+        return
 
-            if locked_date:
-                question_data["locked_date"] = locked_date
+    if not state["last_history_date"] or date > state["last_history_date"]:
+        state["last_history_date"] = date
 
-            question_data["question_id"] = question_id
-            question_data["link"] = link
 
-            if closed_reason:
-                question_data["closed_reason"] = closed_reason
+TIMELINE_HANDLERS = {
+    "migrated": on_migrated,
+    "unprotected": on_unprotected,
+    "closed": on_closed,
+    "protected": on_protected,
+    "locked": on_locked,
+    "made wiki": on_made_wiki,
+}
 
-            question_data["title"] = title
 
-            if withbody and body:
-                question_data["body"] = body
-          
-            items.append(question_data)
-
-    if total:
-        return jsonify({"total": len(items)})
-    
-    sort_key_mapping = {
-    'activity': 'last_activity_date',
-    'creation': 'creation_date',
-    'votes': 'score'
+def empty_timeline():
+    return {
+        "closed_date": None,
+        "closed_reason": None,
+        "protected_date": None,
+        "locked_date": None,
+        "community_owned_date": None,
+        "unprotected": True,
+        "migrated_date": None,
+        "migrated_id": None,
+        "migrated_link": None,
+        "owner_link": None,
+        "owner_name": "",
+        "fallback_name": None,
+        "last_history_date": None,
+        "creation_date": None,
     }
 
-    sort_key = sort_key_mapping.get(sort)
-    
-    if sort_key:
-        if sort in ['votes', 'creation']:
-            if min_value is not None:
-                items = [item for item in items if item[sort_key] >= min_value]
-            if max_value is not None:
-                items = [item for item in items if item[sort_key] <= max_value]
-
-        if order == 'asc':
-            items.sort(key=lambda x: x.get(sort_key, 0))
-        else:
-            items.sort(key=lambda x: x.get(sort_key, 0), reverse=True)
 
-    return Response(json.dumps({"items": items}, indent=4), mimetype='application/json')
+def parse_timeline(content):
 
+    state = empty_timeline()
 
+    nowrap_texts = []
 
+    # Stream the <tr> rows and drop each one once it has been read, so the whole page never sits in memory
+    for _, row in etree.iterparse(BytesIO(content), events=("end",), tag="tr", html=True):
 
+        for owner_link in OWNER_LINK_XPATH(row):
+            state["owner_link"] = owner_link.get('href')
+            state["owner_name"] = element_text(owner_link)
 
+        for cell in NOWRAP_CELL_XPATH(row):
+            nowrap_texts.append("".join(text.strip() for text in cell.itertext()))
+            del nowrap_texts[:-2]
 
-@app.route('/collectives', methods=['GET'])
-def get_all_collectives():
-    url = "https://stackoverflow.com/collectives-all"
-    response = make_request(url)
+        for creation_date_str in CREATION_DATE_XPATH(row):
+            state["creation_date"] = to_timestamp(creation_date_str)
 
-    soup = BeautifulSoup(response.content, "html.parser")
+        date_elements = RELATIVETIME_XPATH(row)
+        event_cells = EVENT_CELL_XPATH(row)
 
+        if row.get('data-eventtype') == 'history' and date_elements and date_elements[0].get('title'):
+            on_history(state, row, to_timestamp(date_elements[0].get('title')))
 
-    order = request.args.get('order', default='desc')
+        if date_elements and date_elements[0].get('title') and event_cells:
 
-    descriptions = []
-    span_tags = soup.find_all("span", class_="fs-body1 v-truncate2 ow-break-word")
-    for span in span_tags:
-        descriptions.append(span.text.strip())
+            event_text = element_text(event_cells[0]).lower()
 
-    a_tags = soup.find_all("a", class_="js-gps-track", href=True)
+            handler = TIMELINE_HANDLERS.get(event_text)
+            if handler is None and 'locked' in event_text:
+                handler = on_locked
 
-    collectives = []
-    for a_tag in soup.find_all("a", class_="js-gps-track", href=True):
-        href = a_tag.get("href")
-        if "/collectives/" in href:
-            slug = href.split("/")[-1]
-            name = a_tag.text.strip() 
-            collectives.append({
-                "slug": slug,
-                "name": name,
-                "link": "https://stackoverflow.com" + href
-            })
+            if handler:
+                handler(state, row, to_timestamp(date_elements[0].get('title')))
 
-    collectives = collectives[:9]
+        row.clear()
+        while row.getprevious() is not None:
+            del row.getparent()[0]
 
-    all_collectives = []
+    if len(nowrap_texts) == 2:
+        state["fallback_name"] = nowrap_texts[0]
 
-    for i, collective in enumerate(collectives):
-        link1 = collective["link"]
-        slug = collective["slug"]
-        name = collective["name"]
-
-        col_text = make_request(link1)
-        col_soup = BeautifulSoup(col_text.content, "html.parser")
-
-        # Get the tags
-        tags = []
-        tag_elements = col_soup.find_all("a", class_="post-tag")
-        for tag in tag_elements:
-            tags.append(tag.text.strip())
-
-
-        # Get the external links
-        external_links = []
-        optgroup = col_soup.find("optgroup", label="External links")
-        if optgroup:
-            options = optgroup.find_all("option")
-            for option in options:
-                link2 = option.get("data-url")
-                link_type = option.text.strip().lower()
-                external_links.append({
-                    "type": link_type,
-                    "link": link2
-                })
-
-        description = descriptions[i] if i < len(descriptions) else ""
-    
-        collective_info = {
-            "tags": tags,
-            "external_links": external_links,
-            "description": description,
-            "link": link1,
-            "name": name,
-            "slug": slug
-        }
+    return state
 
-        all_collectives.append(collective_info)
 
-        all_collectives.sort(key=lambda x: x['name'], reverse=(order == 'desc'))
+def parse_reputation(text):
+    # Reputation is shown as "12,345", "12.3k" or "1.2m" (the suffix is sometimes upper case)
+    reputation_match = REPUTATION_RE.search(text)
+    if not reputation_match:
+        return None
 
+    reputation_number, reputation_suffix = reputation_match.groups()
+    return round(float(reputation_number.replace(',', '')) * REPUTATION_SCALE[reputation_suffix.lower()])
 
-    return jsonify(all_collectives)
 
+def scrape_profile(profile_link):
 
+    # The same owner often appears on several posts, so the parsed profile is reused, not just the page
+    now = time.monotonic()
 
+    profile = cache_lookup(profile_cache, profile_cache_lock, profile_link, now)
+    if profile is None:
+        profile = fetch_profile(profile_link)
+        cache_store(profile_cache, profile_cache_lock, profile_link, now, profile, PROFILE_CACHE_SIZE)
 
+    return profile
 
 
+def fetch_profile(profile_link):
 
-@app.route('/questions/<question_ids>', methods=['GET'])
-def get_questionID(question_ids):
+    acc = make_request(profile_link)
 
-    site = request.args.get('site')
-    if not site or site.lower() != 'stackoverflow':
-        return jsonify({"error": "The 'site' parameter is required and must be 'stackoverflow'"}), 400
+    if acc.status_code != 200:
+        raise ScrapeError("Failed to fetch the owner's profile from Stack Overflow")
 
-    question_ids_list = question_ids.split(';')
-      
-    min_value = request.args.get('min', type=int)
-    max_value = request.args.get('max', type=int)
-    sort = request.args.get('sort', default='activity')
-    order = request.args.get('order', default='desc')
-    filter = request.args.get('filter', default='default')
-
-    withbody = False
-    total = False
-
-    if sort not in ['activity', 'creation', 'votes']:
-        return jsonify({"error": "Invalid sort type"}), 400
+    # The account id is only in the StackExchange.user.init call, so it is read straight from the raw page
+    account_id_match = ACCOUNT_ID_RE.search(acc.content)
+    account_id = account_id_match.group(1).decode() if account_id_match else None
 
-    if filter not in ['default', 'withbody', 'none', 'total']:
-        return jsonify({"error": "Invalid filter type"}), 400
-    if filter == "none":
-        return jsonify({})
-    if filter == "withbody":
-        withbody = True
-    if filter == "total":
-        total = True
+    root = lxml.html.fromstring(acc.content)
 
-    items = []
+    profile_image = first(PROFILE_IMAGE_XPATH(root))
 
-    for question_id in question_ids_list:
-        url = f"https://stackoverflow.com/questions/{question_id}"
+    reputation_div = first(PROFILE_REPUTATION_XPATH(root))
+    reputation = parse_reputation(element_text(reputation_div)) if reputation_div is not None else None
 
-        response = make_request(url)
+    return {
+        "account_id": account_id,
+        "reputation": reputation,
+        "user_id": profile_link.rsplit("/", 2)[-2],
+        "user_type": "registered",
+        "profile_image": profile_image,
+    }
 
-        if response.status_code != 200:
-            return jsonify({"error": "Failed to fetch the question from Stack Overflow"}), 500
 
-        soup = BeautifulSoup(response.content, "html.parser")
+def resolve_owner(timeline, profile_link, display_name, profile_future):
+    # The owner on the timeline takes precedence over the post's user card
+    if timeline["owner_link"]:
 
-        aside_element = soup.find('aside', class_='js-bounty-notification')
+        display_name = timeline["owner_name"]
 
-        bounty_amount = None
-        bounty_closes_date = None
+        if profile_link == "aa":
+            profile_link = "https://stackoverflow.com" + timeline["owner_link"]
 
-        if aside_element:
-            date_span = aside_element.find('span', title=True)
-            date_bounty_str = date_span['title'] if date_span else None
+    if profile_link == "aa":
 
-            date_bounty_norm = datetime.strptime(date_bounty_str, "%Y-%m-%d %H:%M:%SZ")
-            GMT_creation = GMT_zone.localize(date_bounty_norm)
-            zone = GMT_creation.astimezone(pytz.UTC)
-            bounty_closes_date = int(zone.timestamp())
+        if timeline["fallback_name"] is not None:
+            display_name = timeline["fallback_name"]
 
-            bounty_span = aside_element.find('span', class_='s-badge__bounty')
-            bounty_amount = int(bounty_span.text.strip().replace('+', '')) if bounty_span else None
+        return {"user_type": "does_not_exist", "display_name": display_name}
 
-        summary = soup.find("div", class_="question")
+    profile = profile_future.result() if profile_future else scrape_profile(profile_link)
 
-        if summary:
+    return {**profile, "display_name": display_name, "link": profile_link}
 
-            score = 0
 
-            div_tag = summary.find('div', class_='js-voting-container')
-            quest_id = int(div_tag['data-post-id']) if div_tag else None
+def listing_score(summary):
+    score_title = first(SUMMARY_SCORE_XPATH(summary))
+    return int(score_title.split()[-1]) if score_title else None
 
-            div_tag = summary.find('div', class_='js-vote-count')
-            score = int(div_tag['data-value']) if div_tag else None
 
-            user_card = summary.find("div", class_="user-details", itemprop="author") 
-            profile_link = "aa"
-            display_name = ""
+def in_range(value, min_value, max_value):
+    if value is None:
+        return True
+    if min_value is not None and value < min_value:
+        return False
+    if max_value is not None and value > max_value:
+        return False
+    return True
 
-            anchor_tag = user_card.find("a") if user_card else None
 
-            if anchor_tag and anchor_tag.get("href"):
-                profile_link = "https://stackoverflow.com" + anchor_tag["href"]
-                display_name = anchor_tag.text.strip() 
-                            
+# Question fields that are left out of the response when they are empty
+OPTIONAL_QUESTION_FIELDS = frozenset({
+    "migrated_from", "community_owned_date", "last_edited_date", "bounty_amount", "bounty_closes_date",
+    "closed_date", "protected_date", "locked_date", "closed_reason", "body",
+})
 
-            last_edited_date = None
 
-            edited_element = summary.find('a', title="show all edits to this post")
-            if edited_element:
-                last_edited_date_str = edited_element.find('span', class_='relativetime')['title']
-                last_edited_date_norm = datetime.strptime(last_edited_date_str, "%Y-%m-%d %H:%M:%SZ")
-                GMT_last_edited = GMT_zone.localize(last_edited_date_norm)
-                last_edited_date = int(GMT_last_edited.astimezone(pytz.UTC).timestamp())
+def scrape_question(question_id, withbody):
 
+    url = f"https://stackoverflow.com/questions/{question_id}"
 
-            modified_date_element = soup.find('a', href="?lastactivity")
-            modified_date = modified_date_element['title'] if modified_date_element else None
+    response = cached_request(url)
 
-            if modified_date:
-                modified_date_norm = datetime.strptime(modified_date, "%Y-%m-%d %H:%M:%SZ")
-                GMT_last = GMT_zone.localize(modified_date_norm)
-                zone = GMT_last.astimezone(pytz.UTC)
-                last_activity_date = int(zone.timestamp())
+    if response.status_code != 200:
+        raise ScrapeError("Failed to fetch the question from Stack Overflow")
 
-            
-            tag_elements = summary.find_all("a", class_="post-tag")
-            tags = [tag.text.strip() for tag in tag_elements]
+    root = lxml.html.fromstring(response.content)
 
-           
-            view_tag = soup.find('div', class_='flex--item ws-nowrap mb8')
+    aside_element = first(BOUNTY_XPATH(root))
 
-        
-            if view_tag and 'title' in view_tag.attrs:
-                title = view_tag['title']
-                view_str = title.split()[1].replace(',', '')
-                view_count = int(view_str)
-            else:
-                view_count = None
+    bounty_amount = None
+    bounty_closes_date = None
 
-            answer_count = len(soup.find_all("div", class_="answer"))
+    if aside_element is not None:
+        bounty_closes_date = to_timestamp(first(BOUNTY_DATE_XPATH(aside_element)))
 
-            if answer_count > 0:
-                is_answered = True
-            else:
-                is_answered = False
+        bounty_span = first(BOUNTY_AMOUNT_XPATH(aside_element))
+        bounty_amount = int(element_text(bounty_span).replace('+', '')) if bounty_span is not None else None
 
-            title = soup.find("a", class_="question-hyperlink").text.strip()
+    summary = first(QUESTION_XPATH(root))
 
-            link = url
-            
-            time_url = "https://stackoverflow.com/posts/" + str(question_id) + "/timeline"
+    if summary is None:
+        return None
 
-            response_date = make_request(time_url)
-            if response_date.status_code == 200:
-                time_soup = BeautifulSoup(response_date.content, 'html.parser')   
-                
-           
-                closed_date = None
-                closed_reason = None
-                protected_date = None
-                locked_date = None
-                community_owned_date = None
-                unprotected = True
+    vote_count = first(VOTE_COUNT_XPATH(summary))
+    score = int(vote_count) if vote_count else None
 
-                migrated_date = None
-                migrated_id = None
-                migrated_link = None
-        
-                for row in time_soup.find_all('tr'):
-                    
-                    date_element = row.find('span', class_='relativetime')
-                    date_str = date_element['title'] if date_element else None
-
-                    if not date_str:
-                        continue
+    user_card = first(AUTHOR_CARD_XPATH(summary))
+    profile_link = "aa"
+    display_name = ""
 
+    anchor_tag = user_card.find('.//a') if user_card is not None else None
 
-                    date_norm = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%SZ")
-                    GMT_creation = GMT_zone.localize(date_norm)
-                    zone = GMT_creation.astimezone(pytz.UTC)
-                    date = int(zone.timestamp())
+    profile_future = None
 
-                    event_cell = row.find('td', class_='wmn1')
-                    if event_cell:
-                        event_text = event_cell.text.strip().lower()
-
-                
-                        if "migrated" == event_text:
-                            migrated_date = date
-
-                            comment_cell = row.find('td', class_='event-comment')
-                            if comment_cell:
-                                link_tag = comment_cell.find('a')
-                                if link_tag and 'href' in link_tag.attrs:
-                                    migrated_link = link_tag['href']
-                                    match = re.search(r'/questions/(\d+)/', migrated_link)
-                                    if match:
-                                        migrated_id = int(match.group(1))
-                                    else:
-                                        migrated_id = None 
-
-
-                        if 'unprotected' == event_text:
-                            unprotected = False
-
-                        if 'closed' == event_text and not closed_date:
-                            closed_date = date
-                            comment_element = row.find('td', class_='event-comment')
-                            closed_reason = comment_element.text.strip() if comment_element else None
-
-                        if unprotected:
-                            if 'protected' == event_text and not protected_date:
-                                protected_date = date
-
-                        if 'locked' in event_text and not locked_date:
-                            locked_date = date
-
-                        if "made wiki" == event_text:
-                            community_owned_date = date
-    
-                user_not_exist = False
-                display_name = ""
-                profile_elements = time_soup.find_all('a', class_='comment-user owner')
-
-               
-                if profile_elements:
-                  
-                    last_profile_element = profile_elements[-1]
-                    display_name = last_profile_element.text.strip()
-
-                    if profile_link == "aa":
-                        profile_link = "https://stackoverflow.com" + last_profile_element['href']
-
-            
-                    acc = make_request(profile_link)
-
-                    if response.status_code == 200:
-                        acc_soup = BeautifulSoup(acc.content, "html.parser")
-
-                        img_tag = acc_soup.find('div', class_='bar-md bs-sm').find('img')
-                        profile_image = img_tag['src'] if img_tag else None
-
-                        user_id = profile_link.split("/")[-2]
-                        user_type = "registered"
-
-                        reputation_text = acc_soup.find('div', class_='fs-body3 fc-black-600').text
-                        if "m" in reputation_text:
-                            reputation = int(float(reputation_text.replace('m', '').replace(',', '')) * 1_000_000)
-                        elif "k" in reputation_text:
-                            reputation = int(float(reputation_text.replace('k', '').replace(',', '')) * 1000)
-                        else:
-                            reputation = int(reputation_text.replace(',', ''))
-
-                        reputation = int(reputation_text.replace(',', ''))
-
-                        script_tags = acc_soup.find_all("script")
-                        account_id = None
-
-                        for script in script_tags:
-                            script_text = script.string
-                            if script_text and "StackExchange.user.init" in script_text:
-                    
-                                account_id_match = re.search(r'accountId:\s*(\d+)', script_text)
-                                if account_id_match:
-                                    account_id = account_id_match.group(1)
-                                    break
-
-                elif profile_link != "aa":
-
-                    acc = make_request(profile_link)
-
-                    if response.status_code == 200:
-                        acc_soup = BeautifulSoup(acc.content, "html.parser")
-
-                        img_tag = acc_soup.find('div', class_='bar-md bs-sm').find('img')
-                        profile_image = img_tag['src'] if img_tag else None
-
-                        user_id = profile_link.split("/")[-2]
-                        user_type = "registered"
-
-                        reputation_text = acc_soup.find('div', class_='fs-body3 fc-black-600').text
-                        if "m" in reputation_text:
-                            reputation = int(float(reputation_text.replace('m', '').replace(',', '')) * 1_000_000)
-                        elif "k" in reputation_text:
-                            reputation = int(float(reputation_text.replace('k', '').replace(',', '')) * 1000)
-                        else:
-                            reputation = int(reputation_text.replace(',', ''))
-
-                        reputation = int(reputation_text.replace(',', ''))
-
-                        script_tags = acc_soup.find_all("script")
-                        account_id = None
-
-                        for script in script_tags:
-                            script_text = script.string
-                            if script_text and "StackExchange.user.init" in script_text:
-                    
-                                account_id_match = re.search(r'accountId:\s*(\d+)', script_text)
-                                if account_id_match:
-                                    account_id = account_id_match.group(1)
-                                    break
+    if anchor_tag is not None and anchor_tag.get("href"):
+        profile_link = "https://stackoverflow.com" + anchor_tag.get("href")
+        display_name = element_text(anchor_tag)
+        # The profile page has to be scraped for the owner anyway, so start it while the question is parsed
+        profile_future = executor.submit(scrape_profile, profile_link)
 
-                else:
-                    user_not_exist = True
-                    all_tds = time_soup.find_all('td', class_='ws-nowrap')
-                    last_td = all_tds[-2] if all_tds else None
+    # Closed, locked, protected, migrated and wiki questions all show a notice, and the timeline is the only
+    # other source for a missing owner; plain questions have nothing there worth another request
+    timeline_future = None
+    if profile_link == "aa" or POST_NOTICE_XPATH(root) or COMMUNITY_WIKI_XPATH(summary):
+        timeline_future = executor.submit(cached_request, f"https://stackoverflow.com/posts/{question_id}/timeline")
 
-                    if last_td:
-                        display_name = last_td.get_text(strip=True)
+    last_edited_date = None
 
-                date_elements = time_soup.find_all('td', class_='ws-nowrap creation-date')
+    last_edited_date_str = first(LAST_EDITED_XPATH(summary))
+    if last_edited_date_str:
+        last_edited_date = to_timestamp(last_edited_date_str)
 
-                if date_elements:
-                    creation_date_element = date_elements[-1].find('span', class_='relativetime')
-                    creation_date_str = creation_date_element['title'] if creation_date_element else None
-                    creation_date_norm = datetime.strptime(creation_date_str, "%Y-%m-%d %H:%M:%SZ")
-                    GMT_creation = GMT_zone.localize(creation_date_norm)
-                    zone = GMT_creation.astimezone(pytz.UTC)
-                    creation_date = int(zone.timestamp())
 
-            body = None
-            if withbody:
-                body_element = summary.find("div", class_="s-prose")
-                if body_element:
-                    body = body_element.get_text(strip=True)
-                
-            owner_data = OrderedDict()
+    modified_date = first(LAST_ACTIVITY_XPATH(root))
 
-            if user_not_exist:
-                owner_data['user_type'] = "does_not_exist"
-                owner_data['display_name'] = display_name
-            else:
+    if modified_date:
+        last_activity_date = to_timestamp(modified_date)
 
-                owner_data = {
-                    "account_id": account_id,
-                    "reputation": reputation,
-                    "user_id": user_id,
-                    "user_type": user_type,
-                    "profile_image": profile_image,
-                    "display_name": display_name,
-                    "link": profile_link,
-                }
-
-            migration_data = OrderedDict()
 
-            if migrated_id:
-                migration_data["question_id"] = migrated_id
-            
-            if migrated_date:
-                migration_data["on_date"] = migrated_date
+    tags = [tag.strip() for tag in TAG_TEXT_XPATH(summary) if tag.strip()]
 
-            if migrated_link:
-                migration_data["site_url"] = migrated_link
-                
 
-            question_data = OrderedDict()
+    view_title = first(VIEW_COUNT_XPATH(root))
 
-            question_data["tags"] = tags
-
-            if migrated_link or migrated_id or migrated_date:
-                question_data["migrated_from"] = migration_data
+    if view_title:
+        view_str = view_title.split()[1].replace(',', '')
+        view_count = int(view_str)
+    else:
+        view_count = None
 
-            question_data["owner"] = owner_data
-            question_data["is_answered"] = is_answered
-            question_data["view_count"] = view_count
-            question_data["answer_count"] = answer_count
-            
-            if community_owned_date:
-                question_data['community_owned_date'] = community_owned_date
+    # The answers header already carries the count; only count the answer divs if it is missing
+    answer_header_count = first(ANSWER_HEADER_COUNT_XPATH(root))
+    answer_count = int(answer_header_count) if answer_header_count else int(ANSWER_COUNT_XPATH(root))
 
+    if answer_count > 0:
+        is_answered = True
+    else:
+        is_answered = False
 
-            question_data["score"] = score
-            question_data["last_activity_date"] = last_activity_date
-            question_data["creation_date"] = creation_date
-
-            if last_edited_date:
-                question_data["last_edited_date"] = last_edited_date
-
-            if bounty_amount:
-                question_data['bounty_amount'] = bounty_amount
-
-            if bounty_closes_date:
-                question_data["bounty_closes_date"] = bounty_closes_date
+    title = element_text(first(TITLE_XPATH(root)))
 
-            if closed_date:
-                question_data["closed_date"] = closed_date
+    link = url
 
-            if protected_date:
-                question_data["protected_date"] = protected_date
+    timeline = empty_timeline()
+    if timeline_future is not None:
+        response_date = timeline_future.result()
+        if response_date.status_code == 200:
+            timeline = parse_timeline(response_date.content)
 
-            if locked_date:
-                question_data["locked_date"] = locked_date
+    closed_date = timeline["closed_date"]
+    closed_reason = timeline["closed_reason"]
+    protected_date = timeline["protected_date"]
+    locked_date = timeline["locked_date"]
+    community_owned_date = timeline["community_owned_date"]
 
-            question_data["question_id"] = question_id
-            question_data["link"] = link
+    migrated_date = timeline["migrated_date"]
+    migrated_id = timeline["migrated_id"]
+    migrated_link = timeline["migrated_link"]
 
-            if closed_reason:
-                question_data["closed_reason"] = closed_reason
+    owner_data = resolve_owner(timeline, profile_link, display_name, profile_future)
 
-            question_data["title"] = title
+    creation_time = first(CREATION_TIME_XPATH(root))
+    creation_date = to_timestamp(creation_time) if creation_time else None
 
-            if withbody and body:
-                question_data["body"] = body
-          
-            items.append(question_data)
+    body = None
+    if withbody:
+        body_element = first(BODY_XPATH(summary))
+        if body_element is not None:
+            body = inner_html(body_element)
 
-    if total:
-        return jsonify({"total": len(items)})
-    
-    sort_key_mapping = {
-    'activity': 'last_activity_date',
-    'creation': 'creation_date',
-    'votes': 'score'
+    migration_data = {
+        "question_id": migrated_id,
+        "on_date": migrated_date,
+        "site_url": migrated_link,
     }
 
-    sort_key = sort_key_mapping.get(sort)
-    
-    if sort_key:
-        if sort in ['votes', 'creation']:
-            if min_value is not None:
-                items = [item for item in items if item[sort_key] >= min_value]
-            if max_value is not None:
-                items = [item for item in items if item[sort_key] <= max_value]
-
-        if order == 'asc':
-            items.sort(key=lambda x: x.get(sort_key, 0))
-        else:
-            items.sort(key=lambda x: x.get(sort_key, 0), reverse=True)
-
-    return Response(json.dumps({"items": items}, indent=4), mimetype='application/json')
-
-    
-
-
-
-
-
-
-
-@app.route('/answers/<answerIDs>', methods=['GET'])
-def get_answerID(answerIDs):
-
-    site = request.args.get('site')
-    if not site or site.lower() != 'stackoverflow':
-        return jsonify({"error": "The 'site' parameter is required and must be 'stackoverflow'"}), 400
-
-
-
-    answer_ids_list = answerIDs.split(';')
-
-    min_value = request.args.get('min', type=int)
-    max_value = request.args.get('max', type=int)
-    sort = request.args.get('sort', default='activity')
-    order = request.args.get('order', default='desc')
-    filter = request.args.get('filter', default='default')
-
-    withbody = False
-    total = False
-
-    if sort not in ['activity', 'creation', 'votes']:
-        return jsonify({"error": "Invalid sort type"}), 400
-
-    if filter not in ['default', 'withbody', 'none', 'total']:
-        return jsonify({"error": "Invalid filter type"}), 400
-    if filter == "none":
-        return jsonify({})
-    if filter == "withbody":
-        withbody = True
-    if filter == "total":
-        total = True
-
-
+    question_data = {
+        "tags": tags,
+        "migrated_from": {key: value for key, value in migration_data.items() if value},
+        "owner": owner_data,
+        "is_answered": is_answered,
+        "view_count": view_count,
+        "answer_count": answer_count,
+        "community_owned_date": community_owned_date,
+        "score": score,
+        "last_activity_date": last_activity_date,
+        "creation_date": creation_date,
+        "last_edited_date": last_edited_date,
+        "bounty_amount": bounty_amount,
+        "bounty_closes_date": bounty_closes_date,
+        "closed_date": closed_date,
+        "protected_date": protected_date,
+        "locked_date": locked_date,
+        "question_id": question_id,
+        "link": link,
+        "closed_reason": closed_reason,
+        "title": title,
+        "body": body,
+    }
 
+    return {key: value for key, value in question_data.items() if value or key not in OPTIONAL_QUESTION_FIELDS}
 
-    items = []
 
-    for answerID in answer_ids_list:
+def page_question_id(root):
+    post_id = first(POST_ID_XPATH(root))
+    return int(post_id) if post_id else None
 
-        url = f"https://stackoverflow.com/a/{answerID}"
-        response = make_request(url)
 
-        if response.status_code != 200:
-            return jsonify({"error": "Failed to retrieve the answer"}), 404
-        
+def scrape_collective_recommendation(root):
 
-        soup = BeautifulSoup(response.content, "html.parser")
-        answer_summary = soup.find("div", {"id": f"answer-{answerID}"})
+    collective_div = first(COLLECTIVE_XPATH(root))
 
-        if answer_summary:
+    if collective_div is None:
+        return None
 
-            collective_div = soup.find('div', class_='themed-tc')
-            collective_check = False
+    collective_link_tag = collective_div.find('.//a')
+    if collective_link_tag is None or collective_link_tag.get('href') is None:
+        return None
 
-            if collective_div:
-                collective_link_tag = collective_div.find('a')
-                if collective_link_tag and 'href' in collective_link_tag.attrs:
-                    collective_check = True
-                    collective_link = "https://stackoverflow.com" + collective_link_tag['href']
-                    collective_name = collective_link_tag.text.strip()
-                    collective_slug = collective_link_tag['href'].split('/')[-1]
+    collective_link = "https://stackoverflow.com" + collective_link_tag.get('href')
 
-                    col_text = make_request(collective_link)
-                    col_soup = BeautifulSoup(col_text.content, "html.parser")
+    return {
+        **scrape_collective(collective_link),
+        "link": collective_link,
+        "name": element_text(collective_link_tag),
+        "slug": collective_link_tag.get('href').rpartition('/')[2],
+    }
 
-                    tags = []
-                    tag_elements = col_soup.find_all("a", class_="post-tag")
-                    for tag in tag_elements:
-                        tags.append(tag.text.strip())
 
-                    description_div = col_soup.find('div', class_='fs-body1 fc-black-500 d:fc-black-600 mb6 wmx7')
+def scrape_collective(collective_link):
 
-                    collective_description = ""
-                    if description_div:
-                        collective_description = description_div.text.strip()
+    now = time.monotonic()
 
-                    external_links = []
-                    optgroup = col_soup.find("optgroup", label="External links")
-                    if optgroup:
-                        options = optgroup.find_all("option")
-                        for option in options:
-                            link2 = option.get("data-url")
-                            link_type = option.text.strip().lower()
-                            external_links.append({
-                                "type": link_type,
-                                "link": link2
-                            })
+    collective = cache_lookup(collective_cache, collective_cache_lock, collective_link, now)
+    if collective is None:
+        collective = fetch_collective(collective_link)
+        cache_store(collective_cache, collective_cache_lock, collective_link, now, collective, COLLECTIVE_CACHE_SIZE)
 
-                    collective_info = {
-                        "tags": tags,
-                        "external_links": external_links,
-                        "description": collective_description,
-                        "link": collective_link,
-                        "name": collective_name,
-                        "slug": collective_slug
-                    }
+    return collective
 
 
-            user_card = answer_summary.find("div", class_="user-details", itemprop="author") 
+def fetch_collective(collective_link):
 
-            profile_link = "aa"
-            display_name = ""
+    col_text = make_request(collective_link)
 
-            anchor_tag = user_card.find("a") if user_card else None
+    if col_text.status_code != 200:
+        raise ScrapeError("Failed to fetch the collective from Stack Overflow")
 
-            if anchor_tag and anchor_tag.get("href"):
-                profile_link = "https://stackoverflow.com" + anchor_tag["href"]
-                display_name = anchor_tag.text.strip() 
+    col_soup = parse(col_text.content)
 
+    tags = [tag.get_text(strip=True) for tag in col_soup.find_all("a", class_="post-tag")]
 
-            score = 0
+    description_div = col_soup.find('div', class_='fs-body1 fc-black-500 d:fc-black-600 mb6 wmx7')
 
-            div_tag = soup.find('div', class_='js-voting-container')
-            quest_id = int(div_tag['data-post-id']) if div_tag else None
+    collective_description = ""
+    if description_div:
+        collective_description = description_div.text.strip()
 
-            div_tag = answer_summary.find('div', class_='js-vote-count')
-            score = int(div_tag['data-value']) if div_tag else None
+    external_links = []
+    optgroup = col_soup.find("optgroup", label="External links")
+    if optgroup:
+        options = optgroup.find_all("option")
+        for option in options:
+            link2 = option.get("data-url")
+            link_type = option.text.strip().lower()
+            external_links.append({
+                "type": link_type,
+                "link": link2
+            })
 
+    return {
+        "tags": tags,
+        "external_links": external_links,
+        "description": collective_description,
+    }
 
-            is_accepted = False
 
-            accepted_indicator = answer_summary.find('div', class_='js-accepted-answer-indicator')
+def start_answer(answer_summary, withbody):
 
-            if accepted_indicator and 'd-none' not in accepted_indicator.get('class', []):
-                is_accepted = True
+    # Everything on the answer's own block is read here and its fetches are only submitted, so every answer
+    # on a page has its timeline and profile requests in flight before any of them is waited on
+    answerID = answer_summary.get("data-answerid")
 
-            if score > 0:
-                is_accepted = True
+    time_url = "https://stackoverflow.com/posts/" + answerID + "/timeline"
+    timeline_future = executor.submit(make_request, time_url)
 
+    user_card = first(AUTHOR_CARD_XPATH(answer_summary))
 
+    profile_link = "aa"
+    display_name = ""
 
-        edited_element = answer_summary.find('a', title="show all edits to this post")
-        if edited_element:
-            last_edited_date_str = edited_element.find('span', class_='relativetime')['title']
-            last_edited_date_norm = datetime.strptime(last_edited_date_str, "%Y-%m-%d %H:%M:%SZ")
-            GMT_last_edited = GMT_zone.localize(last_edited_date_norm)
-            last_edited_date = int(GMT_last_edited.astimezone(pytz.UTC).timestamp())
+    anchor_tag = user_card.find('.//a') if user_card is not None else None
 
+    if anchor_tag is not None and anchor_tag.get("href"):
+        profile_link = "https://stackoverflow.com" + anchor_tag.get("href")
+        display_name = element_text(anchor_tag)
 
-        time_url = "https://stackoverflow.com/posts/" + str(answerID) + "/timeline"
+    profile_future = executor.submit(scrape_profile, profile_link) if profile_link != "aa" else None
 
-        response_date = make_request(time_url)
-        if response_date.status_code == 200:
-            time_soup = BeautifulSoup(response_date.content, 'html.parser')    
+    vote_count = first(VOTE_COUNT_XPATH(answer_summary))
+    score = int(vote_count) if vote_count else None
 
-
- 
-            locked_date = None
-            community_owned_date = None
-        
-    
-            for row in time_soup.find_all('tr'):
-                
-                date_element = row.find('span', class_='relativetime')
-                date_str = date_element['title'] if date_element else None
-
-                if not date_str:
-                    continue
+    is_accepted = bool(ACCEPTED_XPATH(answer_summary))
 
 
-                date_norm = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%SZ")
-                GMT_creation = GMT_zone.localize(date_norm)
-                zone = GMT_creation.astimezone(pytz.UTC)
-                date = int(zone.timestamp())
+    last_edited_date = None
 
-                event_cell = row.find('td', class_='wmn1')
-                if event_cell:
-                    event_text = event_cell.text.strip().lower()
+    last_edited_date_str = first(LAST_EDITED_XPATH(answer_summary))
+    if last_edited_date_str:
+        last_edited_date = to_timestamp(last_edited_date_str)
 
-                    if 'locked' in event_text and not locked_date:
-                        locked_date = date
+    body = None
+    if withbody:
+        body_element = first(BODY_XPATH(answer_summary))
+        if body_element is not None:
+            body = inner_html(body_element)
 
-                    if "made wiki" == event_text:
-                        community_owned_date = date
+    return {
+        "answer_id": int(answerID),
+        "timeline_future": timeline_future,
+        "profile_future": profile_future,
+        "profile_link": profile_link,
+        "display_name": display_name,
+        "score": score,
+        "is_accepted": is_accepted,
+        "last_edited_date": last_edited_date,
+        "body": body,
+    }
 
 
-            user_not_exist = False
-            display_name = ""
-            profile_elements = time_soup.find_all('a', class_='comment-user owner')
+def finish_answer(pending, quest_id, collective_future):
 
-            
-            if profile_elements:
-                
-                last_profile_element = profile_elements[-1]
-                display_name = last_profile_element.text.strip()
+    response_date = pending["timeline_future"].result()
+    if response_date.status_code != 200:
+        return None
 
-                if profile_link == "aa":
-                    profile_link = "https://stackoverflow.com" + last_profile_element['href']
+    timeline = parse_timeline(response_date.content)
 
-        
-                acc = make_request(profile_link)
+    locked_date = timeline["locked_date"]
+    community_owned_date = timeline["community_owned_date"]
 
-                if response.status_code == 200:
-                    acc_soup = BeautifulSoup(acc.content, "html.parser")
+    owner_data = resolve_owner(timeline, pending["profile_link"], pending["display_name"], pending["profile_future"])
+    if owner_data["user_type"] != "does_not_exist":
+        owner_data["account_id"] = int(owner_data["account_id"])
+        owner_data["user_id"] = int(owner_data["user_id"])
 
-                    img_tag = acc_soup.find('div', class_='bar-md bs-sm').find('img')
-                    profile_image = img_tag['src'] if img_tag else None
+    last_activity_date = timeline["last_history_date"] or ""
 
-                    user_id = profile_link.split("/")[-2]
-                    user_type = "registered"
+    creation_date = timeline["creation_date"]
 
-                    reputation_text = acc_soup.find('div', class_='fs-body3 fc-black-600').text
-                    if "m" in reputation_text:
-                        reputation = int(float(reputation_text.replace('m', '').replace(',', '')) * 1_000_000)
-                    elif "k" in reputation_text:
-                        reputation = int(float(reputation_text.replace('k', '').replace(',', '')) * 1000)
-                    else:
-                        reputation = int(reputation_text.replace(',', ''))
+    answer_data = {}
 
-                    reputation = int(reputation_text.replace(',', ''))
+    collective_info = collective_future.result()
+    if collective_info:
+        answer_data["recommendations"] = [{"collective": collective_info}]
 
-                    script_tags = acc_soup.find_all("script")
-                    account_id = None
+    answer_data["owner"] = owner_data
+    answer_data["is_accepted"] = pending["is_accepted"]
 
-                    for script in script_tags:
-                        script_text = script.string
-                        if script_text and "StackExchange.user.init" in script_text:
-                
-                            account_id_match = re.search(r'accountId:\s*(\d+)', script_text)
-                            if account_id_match:
-                                account_id = account_id_match.group(1)
-                                break
+    if community_owned_date:
+        answer_data["community_owned_date"] = community_owned_date
 
-            elif profile_link != "aa":
+    if locked_date:
+        answer_data["locked_date"] = locked_date
 
-                acc = make_request(profile_link)
+    answer_data["score"] = pending["score"]
+    answer_data["last_activity_date"] = last_activity_date
 
-                if response.status_code == 200:
-                    acc_soup = BeautifulSoup(acc.content, "html.parser")
+    if pending["last_edited_date"]:
+        answer_data["last_edited_date"] = pending["last_edited_date"]
 
-                    img_tag = acc_soup.find('div', class_='bar-md bs-sm').find('img')
-                    profile_image = img_tag['src'] if img_tag else None
+    answer_data["creation_date"] = creation_date
+    answer_data["answer_id"] = pending["answer_id"]
+    answer_data["question_id"] = quest_id
 
-                    user_id = profile_link.split("/")[-2]
-                    user_type = "registered"
+    if pending["body"]:
+        answer_data["body"] = pending["body"]
 
-                    reputation_text = acc_soup.find('div', class_='fs-body3 fc-black-600').text
-                    if "m" in reputation_text:
-                        reputation = int(float(reputation_text.replace('m', '').replace(',', '')) * 1_000_000)
-                    elif "k" in reputation_text:
-                        reputation = int(float(reputation_text.replace('k', '').replace(',', '')) * 1000)
-                    else:
-                        reputation = int(reputation_text.replace(',', ''))
+    return answer_data
 
-                    reputation = int(reputation_text.replace(',', ''))
 
-                    script_tags = acc_soup.find_all("script")
-                    account_id = None
+def fetch_answer_page(answer_id):
 
-                    for script in script_tags:
-                        script_text = script.string
-                        if script_text and "StackExchange.user.init" in script_text:
-                
-                            account_id_match = re.search(r'accountId:\s*(\d+)', script_text)
-                            if account_id_match:
-                                account_id = account_id_match.group(1)
-                                break
+    response = make_request(f"https://stackoverflow.com/a/{answer_id}")
 
-            else:
-                user_not_exist = True
-                all_tds = time_soup.find_all('td', class_='ws-nowrap')
-                last_td = all_tds[-2] if all_tds else None
+    if response.status_code != 200:
+        raise NotFoundError("Failed to retrieve the answer")
 
-                if last_td:
-                    display_name = last_td.get_text(strip=True)
+    root = lxml.html.fromstring(response.content)
 
+    return root, root.get_element_by_id(f"answer-{answer_id}", None)
 
 
+def fetch_question_answers_page(question_id):
 
-            last_history_date = None
+    response = make_request(f"https://stackoverflow.com/questions/{question_id}")
 
-            for row in time_soup.find_all('tr', {'data-eventtype': 'history'}):
-                user_cell = row.find('a', class_='comment-user')
-                date = row.find('span', class_='relativetime')['title']
+    if response.status_code != 200:
+        raise NotFoundError("Failed to retrieve the data")
 
-                if user_cell and user_cell.get('href') == '/users/-1/community':
-                    continue
+    return lxml.html.fromstring(response.content)
 
-                if user_cell and 'comment-user' in user_cell.get('class', []):
-                    if not last_history_date or date > last_history_date:
-                        last_history_date = date
-                          
 
-            if last_history_date:
-                last_history_date_norm = datetime.strptime(last_history_date, "%Y-%m-%d %H:%M:%SZ")
-                GMT_last = GMT_zone.localize(last_history_date_norm)
-                zone = GMT_last.astimezone(pytz.UTC)
-                last_activity_date = int(zone.timestamp())
-            else:
-                last_activity_date = ""
+def count_answer_page(answer_id):
+    _, answer_summary = fetch_answer_page(answer_id)
+    return 0 if answer_summary is None else 1
 
-            date_elements = time_soup.find_all('td', class_='ws-nowrap creation-date')
 
-            if date_elements:
-                creation_date_element = date_elements[-1].find('span', class_='relativetime')
-                creation_date_str = creation_date_element['title'] if creation_date_element else None
-                creation_date_norm = datetime.strptime(creation_date_str, "%Y-%m-%d %H:%M:%SZ")
-                GMT_creation = GMT_zone.localize(creation_date_norm)
-                zone = GMT_creation.astimezone(pytz.UTC)
-                creation_date = int(zone.timestamp())
+def count_question_answers(question_id):
+    return len(ANSWER_XPATH(fetch_question_answers_page(question_id)))
 
-            body = None
-            if withbody:
-                body_element = answer_summary.find("div", class_="s-prose")
-                if body_element:
-                    body = body_element.get_text(strip=True)
 
+def scrape_answer_page(answer_id, withbody):
 
-            owner_data = OrderedDict()
+    root, answer_summary = fetch_answer_page(answer_id)
 
-            if user_not_exist:
-                owner_data['user_type'] = "does_not_exist"
-                owner_data['display_name'] = display_name
-            else:
+    if answer_summary is None:
+        return None
 
-                owner_data = {
-                    "account_id": int(account_id),
-                    "reputation": reputation,
-                    "user_id": int(user_id),
-                    "user_type": user_type,
-                    "profile_image": profile_image,
-                    "display_name": display_name,
-                    "link": profile_link,
-                }
+    collective_future = executor.submit(scrape_collective_recommendation, root)
 
-            answer_data = OrderedDict()
+    return finish_answer(start_answer(answer_summary, withbody), page_question_id(root), collective_future)
 
-            if collective_check:
-                answer_data["recommendations"] = [{"collective": collective_info}]
 
-            answer_data["owner"] = owner_data
-            answer_data["is_accepted"] = is_accepted
+def scrape_question_answers(question_id, withbody):
 
-            if community_owned_date:
-                answer_data["community_owned_date"] = community_owned_date
+    root = fetch_question_answers_page(question_id)
 
-            if locked_date:
-                answer_data["locked_date"] = locked_date
+    # Every answer on the page shares the question's id and collective, so they are only read once
+    quest_id = page_question_id(root)
+    collective_future = executor.submit(scrape_collective_recommendation, root)
 
-            answer_data["score"] = score
-            answer_data["last_activity_date"] = last_activity_date
+    # Start every answer before joining any, so their timeline and profile fetches overlap
+    pending_answers = [start_answer(answer_summary, withbody) for answer_summary in ANSWER_XPATH(root)]
 
-            if edited_element:
-                answer_data["last_edited_date"] = last_edited_date
+    return [finish_answer(pending, quest_id, collective_future) for pending in pending_answers]
 
-            answer_data["creation_date"] = creation_date  
-            answer_data[ "answer_id"] = int(answerID)
-            answer_data["question_id"] = quest_id
 
-            if body:
-                answer_data["body"] = body
+def post_query_params():
+    # /questions/<ids>, /answers/<ids> and /questions/<ids>/answers all take the same query parameters
+    site = request.args.get('site')
+    if not site or site.lower() != 'stackoverflow':
+        return None, (jsonify({"error": "The 'site' parameter is required and must be 'stackoverflow'"}), 400)
 
-            items.append(answer_data)
+    sort = request.args.get('sort', default='activity')
+    filter = request.args.get('filter', default='default')
 
-    if total:
-        return jsonify({"total": len(items)})
+    if sort not in VALID_SORTS:
+        return None, (jsonify({"error": "Invalid sort type"}), 400)
 
-    sort_key_mapping = {
-    'activity': 'last_activity_date',
-    'creation': 'creation_date',
-    'votes': 'score'
+    if filter not in VALID_FILTERS:
+        return None, (jsonify({"error": "Invalid filter type"}), 400)
+    if filter == "none":
+        return None, jsonify({})
+
+    params = {
+        "sort": sort,
+        "order": request.args.get('order', default='desc'),
+        "min_value": request.args.get('min', type=int),
+        "max_value": request.args.get('max', type=int),
+        "withbody": filter == "withbody",
+        "total": filter == "total",
     }
 
-    sort_key = sort_key_mapping.get(sort)
-    
-
-    if sort_key:
-        if sort in ['votes', 'creation']:
-            if min_value is not None:
-                items = [item for item in items if item[sort_key] >= min_value]
-            if max_value is not None:
-                items = [item for item in items if item[sort_key] <= max_value]
-
-        if order == 'asc':
-            items.sort(key=lambda x: x.get(sort_key, 0))
-        else:
-            items.sort(key=lambda x: x.get(sort_key, 0), reverse=True)
-
-    return Response(json.dumps({"items": items}, indent=4), mimetype='application/json')
+    return params, None
 
 
+def sort_items(items, sort, order, min_value, max_value):
 
+    sort_key = SORT_KEYS.get(sort)
 
+    if sort_key:
+        if sort in RANGE_SORTS and (min_value is not None or max_value is not None):
+            items = [item for item in items if in_range(item[sort_key], min_value, max_value)]
 
+        items.sort(key=itemgetter(sort_key), reverse=order != 'asc')
 
+    return items
 
-@app.route('/questions/<question_ids>/answers', methods=['GET'])
-def get_question_answers(question_ids):
 
+@app.route('/questions', methods=['GET'])
+def get_questions():
 
     site = request.args.get('site')
     if not site or site.lower() != 'stackoverflow':
         return jsonify({"error": "The 'site' parameter is required and must be 'stackoverflow'"}), 400
 
 
-    question_ids_list = question_ids.split(';')
-
     min_value = request.args.get('min', type=int)
     max_value = request.args.get('max', type=int)
     sort = request.args.get('sort', default='activity')
     order = request.args.get('order', default='desc')
     filter = request.args.get('filter', default='default')
+    tagged = request.args.get('tagged', default='', type=str)
+    page = request.args.get('page', default=1, type=int)
+    pagesize = request.args.get('pagesize', default=3, type=int)
 
-    withbody = False
-    total = False
-
-    if sort not in ['activity', 'creation', 'votes']:
-        return jsonify({"error": "Invalid sort type"}), 400
-
-    if filter not in ['default', 'withbody', 'none', 'total']:
-        return jsonify({"error": "Invalid filter type"}), 400
-    if filter == "none":
-        return jsonify({})
-    if filter == "withbody":
-        withbody = True
-    if filter == "total":
-        total = True
-
-    
-    items = []
 
+    if sort not in VALID_LISTING_SORTS:
+        return jsonify({"error": INVALID_LISTING_SORT_ERROR}), 400
 
-    for questionID in question_ids_list:
-        url = f"https://stackoverflow.com/questions/{questionID}"
+    if order not in VALID_ORDERS:
+        return jsonify({"error": INVALID_ORDER_ERROR}), 400
 
+    if page < 1:
+        return jsonify({"error": "Page number must be 1 or greater"}), 400
     
-        response = make_request(url)
-
-        if response.status_code != 200:
-            return jsonify({"error": "Failed to retrieve the data"}), 404
-
-        soup = BeautifulSoup(response.content, "html.parser")
-        answers_summary = soup.find_all("div", class_="answer")
-
-        for answer_summary in answers_summary:
-
-
-            answerID = answer_summary.get("data-answerid")
-
-            collective_div = soup.find('div', class_='themed-tc')
-            collective_check = False
-
-            if collective_div:
-                collective_link_tag = collective_div.find('a')
-                if collective_link_tag and 'href' in collective_link_tag.attrs:
-                    collective_check = True
-                    collective_link = "https://stackoverflow.com" + collective_link_tag['href']
-                    collective_name = collective_link_tag.text.strip()
-                    collective_slug = collective_link_tag['href'].split('/')[-1]
-
-                    col_text = make_request(collective_link)
-                    col_soup = BeautifulSoup(col_text.content, "html.parser")
-
-                    tags = []
-                    tag_elements = col_soup.find_all("a", class_="post-tag")
-                    for tag in tag_elements:
-                        tags.append(tag.text.strip())
-
-                    description_div = col_soup.find('div', class_='fs-body1 fc-black-500 d:fc-black-600 mb6 wmx7')
-
-                    collective_description = ""
-                    if description_div:
-                        collective_description = description_div.text.strip()
-
-                    external_links = []
-                    optgroup = col_soup.find("optgroup", label="External links")
-                    if optgroup:
-                        options = optgroup.find_all("option")
-                        for option in options:
-                            link2 = option.get("data-url")
-                            link_type = option.text.strip().lower()
-                            external_links.append({
-                                "type": link_type,
-                                "link": link2
-                            })
-
-                    collective_info = {
-                        "tags": tags,
-                        "external_links": external_links,
-                        "description": collective_description,
-                        "link": collective_link,
-                        "name": collective_name,
-                        "slug": collective_slug
-                    }
-
-
-            user_card = answer_summary.find("div", class_="user-details", itemprop="author") 
-
-            profile_link = "aa"
-            display_name = ""
 
-            anchor_tag = user_card.find("a") if user_card else None
-
-            if anchor_tag and anchor_tag.get("href"):
-                profile_link = "https://stackoverflow.com" + anchor_tag["href"]
-                display_name = anchor_tag.text.strip() 
-
-
-            score = 0
-
-            div_tag = soup.find('div', class_='js-voting-container')
-            quest_id = int(div_tag['data-post-id']) if div_tag else None
-
-            div_tag = answer_summary.find('div', class_='js-vote-count')
-            score = int(div_tag['data-value']) if div_tag else None
+    base_url = "https://stackoverflow.com/questions"
+    url = base_url
 
+    query_params = []
 
-            is_accepted = False
+    tags_to_filter = [tag.strip() for tag in tagged.split(';') if tag.strip()]
+    if len(tags_to_filter) > 3:
+        return jsonify({"error": "You can specify up to 3 tags only."}), 400
+    if tags_to_filter:
+        tags_query = '+'.join(f'[{tag}]' for tag in tags_to_filter)
+        query_params.append(tags_query)
 
-            accepted_indicator = answer_summary.find('div', class_='js-accepted-answer-indicator')
+        query_string = '+'.join(query_params)
+        url = f"{base_url}/tagged/{query_string}"
 
-            if accepted_indicator and 'd-none' not in accepted_indicator.get('class', []):
-                is_accepted = True
 
-            if score > 0:
-                is_accepted = True
+    if sort in TAB_SORTS:
+        if '?' in url:
+            url += f"&tab={sort}"
+        else:
+            url += f"?tab={sort}"
 
+    if '?' in url:
+        url += f"&page={page}"
+    else:
+        url += f"?page={page}"
 
+    print(url)
 
-        edited_element = answer_summary.find('a', title="show all edits to this post")
-        if edited_element:
-            last_edited_date_str = edited_element.find('span', class_='relativetime')['title']
-            last_edited_date_norm = datetime.strptime(last_edited_date_str, "%Y-%m-%d %H:%M:%SZ")
-            GMT_last_edited = GMT_zone.localize(last_edited_date_norm)
-            last_edited_date = int(GMT_last_edited.astimezone(pytz.UTC).timestamp())
+ 
+    withbody = False
+    total = False
 
+    if filter not in VALID_FILTERS:
+        return jsonify({"error": "Invalid filter type"}), 400
+    if filter == "none":
+        return jsonify({})
+    if filter == "withbody":
+        withbody = True
+    if filter == "total":
+        total = True
 
-        time_url = "https://stackoverflow.com/posts/" + answerID + "/timeline"
 
-        response_date = make_request(time_url)
-        if response_date.status_code == 200:
-            time_soup = BeautifulSoup(response_date.content, 'html.parser')    
+    response = make_request(url)
 
+    if response.status_code != 200:
+        return jsonify({"error": "Failed to fetch questions from Stack Overflow"}), 500
 
- 
-            locked_date = None
-            community_owned_date = None
-        
-    
-            for row in time_soup.find_all('tr'):
-                
-                date_element = row.find('span', class_='relativetime')
-                date_str = date_element['title'] if date_element else None
+    if total:
+        soup = parse(response.content, TOTAL_STRAINER)
+        total_div = soup.find('div', class_=TOTAL_CLASS)
+        questions_text = total_div.get_text(strip=True)
+        questions_text = questions_text.replace('\n', '').replace('\r', '').strip()
+        number_of_questions = questions_text.split(' ')[0].replace(',', '')
+        if pagesize < int(number_of_questions):
+            return jsonify({"Total": pagesize})
+        return jsonify({"Total": number_of_questions})
 
-                if not date_str:
-                    continue
+    root = lxml.html.fromstring(response.content)
 
+    summaries = SUMMARY_XPATH(root)[:pagesize]
 
-                date_norm = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%SZ")
-                GMT_creation = GMT_zone.localize(date_norm)
-                zone = GMT_creation.astimezone(pytz.UTC)
-                date = int(zone.timestamp())
+    # Each listing card already shows the score, so questions outside min/max are dropped before any page is fetched
+    if sort == 'votes' and (min_value is not None or max_value is not None):
+        summaries = [summary for summary in summaries if in_range(listing_score(summary), min_value, max_value)]
 
-                event_cell = row.find('td', class_='wmn1')
-                if event_cell:
-                    event_text = event_cell.text.strip().lower()
+    question_ids = [int(summary.get("data-post-id")) for summary in summaries]
 
-                    if 'locked' in event_text and not locked_date:
-                        locked_date = date
+    items = [question_data for question_data in scrape_executor.map(scrape_question, question_ids, repeat(withbody)) if question_data]
 
-                    if "made wiki" == event_text:
-                        community_owned_date = date
+    return items_response(sort_items(items, sort, order, min_value, max_value))
 
 
-            user_not_exist = False
-            display_name = ""
-            profile_elements = time_soup.find_all('a', class_='comment-user owner')
 
-            
-            if profile_elements:
-                
-                last_profile_element = profile_elements[-1]
-                display_name = last_profile_element.text.strip()
 
-                if profile_link == "aa":
-                    profile_link = "https://stackoverflow.com" + last_profile_element['href']
 
-        
-                acc = make_request(profile_link)
 
-                if response.status_code == 200:
-                    acc_soup = BeautifulSoup(acc.content, "html.parser")
+@app.route('/collectives', methods=['GET'])
+def get_all_collectives():
+    url = "https://stackoverflow.com/collectives-all"
+    response = make_request(url)
 
-                    img_tag = acc_soup.find('div', class_='bar-md bs-sm').find('img')
-                    profile_image = img_tag['src'] if img_tag else None
+    if response.status_code != 200:
+        return jsonify({"error": "Failed to fetch collectives from Stack Overflow"}), 500
 
-                    user_id = profile_link.split("/")[-2]
-                    user_type = "registered"
+    soup = parse(response.content)
 
-                    reputation_text = acc_soup.find('div', class_='fs-body3 fc-black-600').text
-                    if "m" in reputation_text:
-                        reputation = int(float(reputation_text.replace('m', '').replace(',', '')) * 1_000_000)
-                    elif "k" in reputation_text:
-                        reputation = int(float(reputation_text.replace('k', '').replace(',', '')) * 1000)
-                    else:
-                        reputation = int(reputation_text.replace(',', ''))
 
-                    reputation = int(reputation_text.replace(',', ''))
+    order = request.args.get('order', default='desc')
 
-                    script_tags = acc_soup.find_all("script")
-                    account_id = None
+    descriptions = []
+    span_tags = soup.find_all("span", class_="fs-body1 v-truncate2 ow-break-word")
+    for span in span_tags:
+        descriptions.append(span.text.strip())
 
-                    for script in script_tags:
-                        script_text = script.string
-                        if script_text and "StackExchange.user.init" in script_text:
-                
-                            account_id_match = re.search(r'accountId:\s*(\d+)', script_text)
-                            if account_id_match:
-                                account_id = account_id_match.group(1)
-                                break
+    collectives = []
+    for a_tag in soup.find_all("a", class_="js-gps-track", href=True):
+        href = a_tag.get("href")
+        if "/collectives/" in href:
+            slug = href.rpartition("/")[2]
+            name = a_tag.text.strip() 
+            collectives.append({
+                "slug": slug,
+                "name": name,
+                "link": "https://stackoverflow.com" + href
+            })
 
-            elif profile_link != "aa":
+    collectives = collectives[:9]
 
-                acc = make_request(profile_link)
+    collective_pages = executor.map(scrape_collective, [collective["link"] for collective in collectives])
 
-                if response.status_code == 200:
-                    acc_soup = BeautifulSoup(acc.content, "html.parser")
+    all_collectives = []
+    for i, (collective, collective_page) in enumerate(zip(collectives, collective_pages)):
+        all_collectives.append({
+            **collective_page,
+            "description": descriptions[i] if i < len(descriptions) else "",
+            "link": collective["link"],
+            "name": collective["name"],
+            "slug": collective["slug"]
+        })
 
-                    img_tag = acc_soup.find('div', class_='bar-md bs-sm').find('img')
-                    profile_image = img_tag['src'] if img_tag else None
+    all_collectives.sort(key=lambda x: x['name'], reverse=(order == 'desc'))
 
-                    user_id = profile_link.split("/")[-2]
-                    user_type = "registered"
+    return json_response(all_collectives)
 
-                    reputation_text = acc_soup.find('div', class_='fs-body3 fc-black-600').text
-                    if "m" in reputation_text:
-                        reputation = int(float(reputation_text.replace('m', '').replace(',', '')) * 1_000_000)
-                    elif "k" in reputation_text:
-                        reputation = int(float(reputation_text.replace('k', '').replace(',', '')) * 1000)
-                    else:
-                        reputation = int(reputation_text.replace(',', ''))
 
-                    reputation = int(reputation_text.replace(',', ''))
 
-                    script_tags = acc_soup.find_all("script")
-                    account_id = None
 
-                    for script in script_tags:
-                        script_text = script.string
-                        if script_text and "StackExchange.user.init" in script_text:
-                
-                            account_id_match = re.search(r'accountId:\s*(\d+)', script_text)
-                            if account_id_match:
-                                account_id = account_id_match.group(1)
-                                break
 
-            else:
-                user_not_exist = True
-                all_tds = time_soup.find_all('td', class_='ws-nowrap')
-                last_td = all_tds[-2] if all_tds else None
 
-                if last_td:
-                    display_name = last_td.get_text(strip=True)
 
+@app.route('/questions/<question_ids>', methods=['GET'])
+def get_questionID(question_ids):
 
+    params, early_response = post_query_params()
+    if early_response is not None:
+        return early_response
 
+    question_ids_list = question_ids.split(';')
 
-            last_history_date = None
+    items = [question_data for question_data in scrape_executor.map(scrape_question, question_ids_list, repeat(params["withbody"])) if question_data]
 
-            for row in time_soup.find_all('tr', {'data-eventtype': 'history'}):
-                user_cell = row.find('a', class_='comment-user')
-                date = row.find('span', class_='relativetime')['title']
+    if params["total"]:
+        return jsonify({"total": len(items)})
 
-                if user_cell and user_cell.get('href') == '/users/-1/community':
-                    continue
+    return items_response(sort_items(items, params["sort"], params["order"], params["min_value"], params["max_value"]))
 
-                if user_cell and 'comment-user' in user_cell.get('class', []):
-                    if not last_history_date or date > last_history_date:
-                        last_history_date = date
-                          
 
-            if last_history_date:
-                last_history_date_norm = datetime.strptime(last_history_date, "%Y-%m-%d %H:%M:%SZ")
-                GMT_last = GMT_zone.localize(last_history_date_norm)
-                zone = GMT_last.astimezone(pytz.UTC)
-                last_activity_date = int(zone.timestamp())
-            else:
-                last_activity_date = ""
 
-            date_elements = time_soup.find_all('td', class_='ws-nowrap creation-date')
 
-            if date_elements:
-                creation_date_element = date_elements[-1].find('span', class_='relativetime')
-                creation_date_str = creation_date_element['title'] if creation_date_element else None
-                creation_date_norm = datetime.strptime(creation_date_str, "%Y-%m-%d %H:%M:%SZ")
-                GMT_creation = GMT_zone.localize(creation_date_norm)
-                zone = GMT_creation.astimezone(pytz.UTC)
-                creation_date = int(zone.timestamp())
 
-            body = None
-            if withbody:
-                body_element = answer_summary.find("div", class_="s-prose")
-                if body_element:
-                    body = body_element.get_text(strip=True)
 
 
-            owner_data = OrderedDict()
+@app.route('/answers/<answerIDs>', methods=['GET'])
+def get_answerID(answerIDs):
 
-            if user_not_exist:
-                owner_data['user_type'] = "does_not_exist"
-                owner_data['display_name'] = display_name
-            else:
+    params, early_response = post_query_params()
+    if early_response is not None:
+        return early_response
 
-                owner_data = {
-                    "account_id": int(account_id),
-                    "reputation": reputation,
-                    "user_id": int(user_id),
-                    "user_type": user_type,
-                    "profile_image": profile_image,
-                    "display_name": display_name,
-                    "link": profile_link,
-                }
+    answer_ids_list = answerIDs.split(';')
 
-            answer_data = OrderedDict()
+    # Counting only needs the answer pages, not the timelines, profiles and collectives behind each answer
+    if params["total"]:
+        return jsonify({"total": sum(scrape_executor.map(count_answer_page, answer_ids_list))})
 
-            if collective_check:
-                answer_data["recommendations"] = [{"collective": collective_info}]
+    items = [answer_data for answer_data in scrape_executor.map(scrape_answer_page, answer_ids_list, repeat(params["withbody"])) if answer_data]
 
-            answer_data["owner"] = owner_data
-            answer_data["is_accepted"] = is_accepted
+    return items_response(sort_items(items, params["sort"], params["order"], params["min_value"], params["max_value"]))
 
-            if community_owned_date:
-                answer_data["community_owned_date"] = community_owned_date
 
-            if locked_date:
-                answer_data["locked_date"] = locked_date
 
-            answer_data["score"] = score
-            answer_data["last_activity_date"] = last_activity_date
 
-            if edited_element:
-                answer_data["last_edited_date"] = last_edited_date
 
-            answer_data["creation_date"] = creation_date  
-            answer_data[ "answer_id"] = int(answerID)
-            answer_data["question_id"] = quest_id
 
-            if body:
-                answer_data["body"] = body
 
-            items.append(answer_data)
+@app.route('/questions/<question_ids>/answers', methods=['GET'])
+def get_question_answers(question_ids):
 
-    if total:
-        return jsonify({"total": len(items)})
+    params, early_response = post_query_params()
+    if early_response is not None:
+        return early_response
 
-    sort_key_mapping = {
-    'activity': 'last_activity_date',
-    'creation': 'creation_date',
-    'votes': 'score'
-    }
+    question_ids_list = question_ids.split(';')
 
-    sort_key = sort_key_mapping.get(sort)
-    
+    # Counting only needs the question pages, not the timelines, profiles and collectives behind each answer
+    if params["total"]:
+        return jsonify({"total": sum(scrape_executor.map(count_question_answers, question_ids_list))})
 
-    if sort_key:
-        if sort in ['votes', 'creation']:
-            if min_value is not None:
-                items = [item for item in items if item[sort_key] >= min_value]
-            if max_value is not None:
-                items = [item for item in items if item[sort_key] <= max_value]
-
-        if order == 'asc':
-            items.sort(key=lambda x: x.get(sort_key, 0))
-        else:
-            items.sort(key=lambda x: x.get(sort_key, 0), reverse=True)
+    items = [
+        answer_data
+        for answers in scrape_executor.map(scrape_question_answers, question_ids_list, repeat(params["withbody"]))
+        for answer_data in answers
+        if answer_data
+    ]
 
-    return Response(json.dumps({"items": items}, indent=4), mimetype='application/json')
+    return items_response(sort_items(items, params["sort"], params["order"], params["min_value"], params["max_value"]))
 
 
 